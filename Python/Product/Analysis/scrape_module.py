@@ -42,6 +42,11 @@ try:
 except NameError:
     unicode = str
 
+try:
+    intern = sys.intern
+except AttributeError:
+    pass    # Python 2 has intern() as a builtin
+
 class InspectWarning(UserWarning): pass
 
 def _triple_quote(s):
@@ -56,11 +61,20 @@ def _triple_quote(s):
     return "''' " + s.replace("'''", "\\'\\'\\'") + " '''"
 
 
+IS_PY2 = sys.version_info[0] == 2
+MODULE_TYPE = type(sys)
+GETARGSPEC = getattr(inspect, 'getfullargspec', None) or getattr(inspect, 'getargspec', None)
 SKIP_TYPENAME_FOR_TYPES = bool, str, bytes, int, float
 STATICMETHOD_TYPES = ()
 CLASSMETHOD_TYPES = type(float.fromhex),
 PROPERTY_TYPES = type(int.real), type(property.fget)
 
+# Decorators are compared often, so share interned instances. Plain
+# identifiers such as 'self' and '__init__' are interned by the compiler.
+STATICMETHOD_DECORATOR = intern('@staticmethod')
+CLASSMETHOD_DECORATOR = intern('@classmethod')
+PROPERTY_DECORATOR = intern('@property')
+
 # These full names are known to be lies. When we encounter
 # them while scraping a module, assume that we need to write
 # out the full type rather than including them by reference.
@@ -88,16 +102,47 @@ VALUE_REPR_FIX = {
 if sys.version_info[0] < 3:
     SKIP_TYPENAME_FOR_TYPES += unicode, long
 
+KEYWORDS = frozenset(keyword.kwlist)
+
+# Sentinel for dictionary lookups where None is a meaningful value
+_MISSING = object()
+
+# Patterns used to massage example calls found in docstrings
+_RE_OPT_BRACKETS = re.compile(r'[\[\]]')
+_RE_DOTTED_CALL = re.compile(r'^(\w+)\.(\w+)\(')
+_RE_KW_DEFAULT = re.compile(r'\=.+?([,\)])')
+
+if IS_PY2:
+    class _OldStyle: pass
+    CLASSOBJ_TYPE = type(_OldStyle)
+    del _OldStyle
+else:
+    CLASSOBJ_TYPE = None
+
 def safe_callable(v):
+    # callable() checks the type's call slot directly rather than
+    # resolving (and possibly failing) an attribute lookup on v.
+    # Old-style classes are always callable, but are only treated as
+    # callable if they define or inherit __call__, as before.
     try:
-        return hasattr(v, '__call__')
+        if type(v) is CLASSOBJ_TYPE:
+            return hasattr(v, '__call__')
+        return callable(v)
     except Exception:
         return False
 
+# Most members need the same one or two imports, so share the tuples
+_IMPORTS_CACHE = {}
+
+def _shared_imports(*modules):
+    return _IMPORTS_CACHE.setdefault(modules, modules)
+
 class Signature(object):
     # These two dictionaries start with Python 3 values.
     # There is an update below for Python 2 differences.
     # They will be used as fallbacks for known protocols
+    # Add entries with update_known(), not by mutating the dictionaries
+    # directly, or the name sets below will not include them.
 
     KNOWN_RESTYPES = {
         "__abs__": "__T__()",
@@ -215,6 +260,16 @@ class Signature(object):
         "__trunc__": "(self)",
     }
 
+    # Unqualified names that have an entry in the tables above, so other
+    # names can skip the lookups. Only update_known() keeps these in sync
+    # with the tables; entries added any other way are never found.
+    KNOWN_RESTYPE_NAMES = frozenset(k.rpartition('.')[2] for k in KNOWN_RESTYPES)
+    KNOWN_ARGSPEC_NAMES = frozenset(k.rpartition('.')[2] for k in KNOWN_ARGSPECS)
+
+    __slots__ = (
+        'callable', 'name', 'scope', 'decorators', '_doc', '_signature',
+        '_defaults', 'fullsig', 'restype',
+    )
 
     def __init__(self,
         name,
@@ -224,16 +279,18 @@ class Signature(object):
         scope_alias=None,
         decorators=None,
         module_doc=None,
+        doc=_MISSING,
     ):
         self.callable = callable
         self.name = name
         self.scope = scope
         self.decorators = decorators or ()
+        self._doc = doc
         self._signature = None
         self._defaults = defaults or ()
 
-        if scope and '@staticmethod' not in self.decorators:
-            def_arg = 'cls' if '@classmethod' in self.decorators else 'self'
+        if scope and STATICMETHOD_DECORATOR not in self.decorators:
+            def_arg = 'cls' if CLASSMETHOD_DECORATOR in self.decorators else 'self'
             if len(self._defaults) == 0 or self._defaults[0] != def_arg:
                 self._defaults = (def_arg,) + self._defaults
         
@@ -242,7 +299,7 @@ class Signature(object):
             self.fullsig = self._init_argspec_fromdocstring(self._defaults, module_doc)
         elif not hasattr(self.callable, '__call__') and hasattr(self.callable, '__get__'):
             # We have a property
-            self.decorators = '@property',
+            self.decorators = PROPERTY_DECORATOR,
             self.fullsig = self.name + "(" + ", ".join(self._defaults) + ")"
         
         self.fullsig = (
@@ -269,10 +326,19 @@ class Signature(object):
     def __str__(self):
         return self.fullsig
 
+    def _get_signature(self):
+        '''Returns the inspect.signature() of the callable, or None. The
+        result is computed on first use and then cached.'''
+        if self._signature is None:
+            try:
+                self._signature = inspect.signature(self.callable)
+            except Exception:
+                self._signature = False
+        return self._signature or None
+
     def _init_argspec_fromsignature(self, defaults):
-        try:
-            sig = inspect.signature(self.callable)
-        except Exception:
+        sig = self._get_signature()
+        if sig is None:
             return
 
         new_args = []
@@ -291,9 +357,8 @@ class Signature(object):
         return self.name + str(sig)
 
     def _init_restype_fromsignature(self):
-        try:
-            sig = inspect.signature(self.callable)
-        except Exception:
+        sig = self._get_signature()
+        if sig is None:
             return
 
         # If signature has a return annotation, it's in the
@@ -302,7 +367,7 @@ class Signature(object):
 
     def _init_argspec_fromargspec(self, defaults):
         try:
-            args = (getattr(inspect, 'getfullargspec', None) or inspect.getargspec)(self.callable)
+            args = GETARGSPEC(self.callable)
         except Exception:
             return
 
@@ -315,27 +380,38 @@ class Signature(object):
         self._insert_default_arguments(argn, defaults)
         return self.name + '(' + ', '.join(argn) + ')'
 
+    @classmethod
+    def update_known(cls, restypes, argspecs):
+        cls.KNOWN_RESTYPES.update(restypes)
+        cls.KNOWN_ARGSPECS.update(argspecs)
+        cls.KNOWN_RESTYPE_NAMES = frozenset(k.rpartition('.')[2] for k in cls.KNOWN_RESTYPES)
+        cls.KNOWN_ARGSPEC_NAMES = frozenset(k.rpartition('.')[2] for k in cls.KNOWN_ARGSPECS)
+
+    def _lookup_known(self, mapping, scope_alias):
+        value = None
+        if scope_alias:
+            value = mapping.get(scope_alias + '.' + self.name)
+        if self.scope and not value:
+            value = mapping.get(self.scope + '.' + self.name)
+        if not value:
+            value = mapping.get(self.name)
+        return value
+
     def _init_argspec_fromknown(self, defaults, scope_alias):
-        spec = None
-        if scope_alias and not spec:
-            spec = self.KNOWN_ARGSPECS.get(scope_alias + '.' + self.name)
-        if self.scope and not spec:
-            spec = self.KNOWN_ARGSPECS.get(self.scope + '.' + self.name)
-        if not spec:
-            spec = self.KNOWN_ARGSPECS.get(self.name)
+        if self.name not in self.KNOWN_ARGSPEC_NAMES:
+            return
+
+        spec = self._lookup_known(self.KNOWN_ARGSPECS, scope_alias)
         if not spec:
             return
 
         return self.name + spec
 
     def _init_restype_fromknown(self, scope_alias):
-        restype = None
-        if scope_alias and not restype:
-            restype = self.KNOWN_RESTYPES.get(scope_alias + '.' + self.name)
-        if self.scope and not restype:
-            restype = self.KNOWN_RESTYPES.get(self.scope + '.' + self.name)
-        if not restype:
-            restype = self.KNOWN_RESTYPES.get(self.name)
+        if self.name not in self.KNOWN_RESTYPE_NAMES:
+            return
+
+        restype = self._lookup_known(self.KNOWN_RESTYPES, scope_alias)
         if not restype:
             return
 
@@ -346,7 +422,9 @@ class Signature(object):
     def _init_argspec_fromdocstring(self, defaults, doc=None):
         allow_name_mismatch = True
         if not doc:
-            doc = getattr(self.callable, '__doc__', None)
+            doc = self._doc
+            if doc is _MISSING:
+                doc = getattr(self.callable, '__doc__', None)
             allow_name_mismatch = False
         if not isinstance(doc, str):
             return
@@ -358,18 +436,18 @@ class Signature(object):
         call = self._parse_funcdef(doc, allow_name_mismatch)
         if not call:
             # Remove optional parameter marks
-            doc = re.sub(r'[\[\]]', '', doc)
+            doc = _RE_OPT_BRACKETS.sub('', doc)
             call = self._parse_funcdef(doc, allow_name_mismatch)
         if not call:
             # Replace "X.y(" with y(self : X,"
-            doc2 = re.sub(r'^(\w+)\.(\w+)\(', r'\2(self : \1, ', doc)
+            doc2 = _RE_DOTTED_CALL.sub(r'\2(self : \1, ', doc)
             call = self._parse_funcdef(doc2, allow_name_mismatch)
         if not call:
             # Replace "X.y(" with y(self,"
-            doc2 = re.sub(r'^(\w+)\.(\w+)\(', r'\2(self, ', doc)
+            doc2 = _RE_DOTTED_CALL.sub(r'\2(self, ', doc)
             call = self._parse_funcdef(doc2, allow_name_mismatch)
         if not call:
-            doc = re.sub(r'\=.+?([,\)])', r'\1', doc)
+            doc = _RE_KW_DEFAULT.sub(r'\1', doc)
             call = self._parse_funcdef(doc, allow_name_mismatch)
         if not call:
             return
@@ -381,7 +459,9 @@ class Signature(object):
     def _insert_default_arguments(self, args, defaults):
         if len(args) < len(defaults):
             args[:0] = defaults
-        else:
+        elif args[:len(defaults)] != list(defaults):
+            # Only walk the arguments when the common case of them
+            # already starting with the defaults does not apply.
             for i, (x, y) in enumerate(zip(defaults, args)):
                 if x == 'cls' and y == 'type':
                     continue
@@ -410,14 +490,22 @@ class Signature(object):
         if not expr or ')' not in expr:
             return
         expr = expr.lstrip('\r\n\t ')
+        # Jump between parentheses with str.find rather than testing
+        # every character, since docstrings can be very long.
         n = 0
-        for i, c in enumerate(expr):
-            if c == ')':
+        i = 0
+        close_paren = expr.find(')')
+        while close_paren >= 0:
+            open_paren = expr.find('(', i, close_paren)
+            if open_paren >= 0:
+                n += 1
+                i = open_paren + 1
+            else:
                 n -= 1
                 if n <= 0:
-                    return expr[:i + 1]
-            elif c == '(':
-                n += 1
+                    return expr[:close_paren + 1]
+                i = close_paren + 1
+                close_paren = expr.find(')', i)
 
     def _ast_args_to_list(self, node):
         args = node.args
@@ -432,14 +520,14 @@ class Signature(object):
     ) if hasattr(ast, n))
 
     class DefaultValueWriter(object):
+        __slots__ = ()
+
         def walk(self, node):
-            try:
-                op = getattr(self, 'walk_' + type(node).__name__)
-            except AttributeError:
+            op = self._DISPATCH.get(type(node).__name__)
+            if op is None:
                 print('walk_' + type(node).__name__, vars(node), file=sys.stderr)
                 return None
-            else:
-                return op(node)
+            return op(self, node)
 
         def walk_BitOr(self, node):         return '|'
         def walk_Call(self, node):          pass    # Do not generate defaults from calls
@@ -482,6 +570,23 @@ class Signature(object):
             if op and value:
                 return op + value
 
+        # Maps AST node type names to the walk_* function handling them
+        _DISPATCH = {
+            'Attribute': walk_Attribute,
+            'BinOp': walk_BinOp,
+            'BitOr': walk_BitOr,
+            'Call': walk_Call,
+            'Dict': walk_Dict,
+            'List': walk_List,
+            'Name': walk_Name,
+            'NameConstant': walk_NameConstant,
+            'Num': walk_Num,
+            'Str': walk_Str,
+            'Tuple': walk_Tuple,
+            'USub': walk_USub,
+            'UnaryOp': walk_UnaryOp,
+        }
+
     def _ast_arg_to_str(self, arg, default, seen_names):
         '''Converts an AST argument object into a string.'''
         arg_id = None
@@ -540,6 +645,12 @@ class Signature(object):
 class MemberInfo(object):
     NO_VALUE = object()
 
+    __slots__ = (
+        'name', 'value', 'literal', 'members', 'values', 'need_imports',
+        'type_name', 'scope_name', 'bases', 'signature', 'documentation',
+        'alias',
+    )
+
     def __init__(self, name, value, literal=None, scope=None, module=None, alias=None, module_doc=None, scope_alias=None):
         self.name = name
         self.value = value
@@ -580,26 +691,30 @@ class MemberInfo(object):
                             continue
                         self.bases.append(t)
                         self.need_imports.extend(ni)
+                    self.need_imports = _shared_imports(*self.need_imports)
 
         elif safe_callable(value):
             dec = ()
             if scope:
                 if value_type in STATICMETHOD_TYPES:
-                    dec += '@staticmethod',
+                    dec += STATICMETHOD_DECORATOR,
                 elif value_type in CLASSMETHOD_TYPES:
-                    dec += '@classmethod',
-            self.signature = Signature(name, value, scope, scope_alias=scope_alias, decorators=dec, module_doc=module_doc)
+                    dec += CLASSMETHOD_DECORATOR,
+            self.signature = Signature(name, value, scope, scope_alias=scope_alias, decorators=dec, module_doc=module_doc, doc=self.documentation)
         elif value is not None:
             if value_type in PROPERTY_TYPES:
-                self.signature = Signature(name, value, scope, scope_alias=scope_alias)
+                self.signature = Signature(name, value, scope, scope_alias=scope_alias, doc=self.documentation)
             if value_type not in SKIP_TYPENAME_FOR_TYPES:
                 self.need_imports, self.type_name = self._get_typename(value_type, module)
-            if isinstance(value, float) and repr(value) == 'nan':
+            if isinstance(value, float) and value != value:
                 self.literal = "float('nan')"
-            try:
-                self.literal = VALUE_REPR_FIX[value]
-            except Exception:
-                pass
+            else:
+                # Values that compare equal to infinity (such as
+                # Decimal('Inf')) are fixed up as well
+                try:
+                    self.literal = VALUE_REPR_FIX.get(value, self.literal)
+                except Exception:
+                    pass    # unhashable values have no fix
         elif not self.literal:
             self.literal = 'None'
 
@@ -610,19 +725,19 @@ class MemberInfo(object):
             module = getattr(value_type, '__module__', None)
 
             # Special workaround for Python 2 exceptions lying about their module
-            if sys.version_info[0] == 2 and module == 'exceptions' and in_module == builtins.__name__:
+            if IS_PY2 and module == 'exceptions' and in_module == builtins.__name__:
                 module = builtins.__name__
 
             if module and module != '<unknown>':
                 if module == in_module:
-                    return (module,), type_name
+                    return _shared_imports(module), type_name
 
                 fullname = module + '.' + type_name
                 if fullname in LIES_ABOUT_MODULE:
                     # Treat the type as if it came from the current module
-                    return (in_module,), type_name
+                    return _shared_imports(in_module), type_name
 
-                return (module,), fullname
+                return _shared_imports(module), fullname
             return (), type_name
         except Exception:
             warnings.warn('could not get type of ' + repr(value), InspectWarning)
@@ -637,20 +752,21 @@ class MemberInfo(object):
     def _str_from_value(self, v):
         return self.name + ' = ' + repr(v)
 
-    def _lines_with_members(self):
+    def _emit_with_members(self, out, indent):
         if self.bases:
-            yield 'class ' + self.name + '(' + ','.join(self.bases) + '):'
+            out.append(indent + 'class ' + self.name + '(' + ','.join(self.bases) + '):')
         else:
-            yield 'class ' + self.name + ':'
+            out.append(indent + 'class ' + self.name + ':')
+        member_indent = indent + '    '
         if self.documentation:
-            yield '    ' + repr(self.documentation)
+            out.append(member_indent + repr(self.documentation))
         if self.members:
             for mi in self.members:
                 if mi is not MemberInfo.NO_VALUE:
-                    yield mi.as_str('    ')
+                    mi._emit(out, member_indent)
         else:
-            yield '    pass'
-        yield ''
+            out.append(member_indent + 'pass')
+        out.append(indent)
 
     def _lines_with_signature(self):
         seen_decorators = set()
@@ -669,22 +785,25 @@ class MemberInfo(object):
         yield ''
 
     def as_str(self, indent=''):
-        if self.literal:
-            return indent + self._str_from_literal(self.literal)
-
-        if self.members:
-            return '\n'.join(indent + s for s in self._lines_with_members())
-
-        if self.signature:
-            return '\n'.join(indent + s for s in self._lines_with_signature())
-
-        if self.type_name is not None:
-            return indent + self._str_from_typename(self.type_name)
-
-        if self.value is not None:
-            return indent + self._str_from_value(self.value)
+        out = []
+        self._emit(out, indent)
+        return '\n'.join(out)
 
-        return indent + self.name
+    def _emit(self, out, indent):
+        '''Appends the lines for this member to the out list. Nested
+        members are written into the same list.'''
+        if self.literal:
+            out.append(indent + self._str_from_literal(self.literal))
+        elif self.members:
+            self._emit_with_members(out, indent)
+        elif self.signature:
+            out.extend([indent + s for s in self._lines_with_signature()])
+        elif self.type_name is not None:
+            out.append(indent + self._str_from_typename(self.type_name))
+        elif self.value is not None:
+            out.append(indent + self._str_from_value(self.value))
+        else:
+            out.append(indent + self.name)
 
 
 MODULE_MEMBER_SUBSTITUTE = {
@@ -709,6 +828,16 @@ class ScrapeState(object):
 
         self.imports = set()
         self.members = []
+        # Sorted imports (excluding this module), or None when they need
+        # to be recalculated from self.imports
+        self._sorted_imports = None
+
+        # Messages from the member collection loops are reported together
+        # by _flush_warnings rather than warning for each one.
+        self._warnings = []
+
+        # Names provided by each metaclass, see _get_meta_names
+        self._meta_names = {}
 
     def initial_import(self, search_path=None):
         if self.module:
@@ -762,16 +891,21 @@ class ScrapeState(object):
 
         self.module = mod
 
-    def collect_top_level_members(self):
-        self._collect_members(self.module, self.members, MODULE_MEMBER_SUBSTITUTE, None)
+    def collect_top_level_members(self, excluded=()):
+        '''Collects the members of the module, except for any names
+        in excluded.'''
+        m_names = self._collect_members(self.module, self.members, MODULE_MEMBER_SUBSTITUTE, None, self.imports, excluded)
 
-        m_names = set(m.name for m in self.members)
         undeclared = []
         for m in self.members:
             if m.value is not None and m.type_name and '.' not in m.type_name and m.type_name not in m_names:
                 undeclared.append(MemberInfo(m.type_name, type(m.value), module=self.module_name))
 
         self.members[:0] = undeclared
+        for m in undeclared:
+            self.imports.update(m.need_imports)
+        self._sorted_imports = None
+        self._flush_warnings()
 
     def _should_collect_members(self, member):
         if self.module_name in member.need_imports and member.name == member.type_name:
@@ -792,16 +926,38 @@ class ScrapeState(object):
                     # class. To emulate this, we add '@staticmethod' decorators to
                     # all members.
                     for mi2 in mi.members:
-                        if mi2.signature:
-                            mi2.signature.decorators += '@staticmethod',
-
-    def _collect_members(self, mod, members, substitutes, outer_member):
+                        if mi2.signature and STATICMETHOD_DECORATOR not in mi2.signature.decorators:
+                            mi2.signature.decorators += STATICMETHOD_DECORATOR,
+
+        self._flush_warnings()
+        self._sorted_imports = self._get_sorted_imports()
+
+    def _get_sorted_imports(self):
+        if self._sorted_imports is None:
+            return tuple(sorted(self.imports.difference((self.module_name,))))
+        return self._sorted_imports
+
+    def _flush_warnings(self):
+        if self._warnings:
+            warnings.warn('\n'.join(self._warnings), InspectWarning)
+            del self._warnings[:]
+
+    def add_members(self, members):
+        '''Adds a list of top-level members and records their imports.'''
+        self.members.extend(members)
+        for mi in members:
+            self.imports.update(mi.need_imports)
+        self._sorted_imports = None
+
+    def _collect_members(self, mod, members, substitutes, outer_member, imports=None, excluded=()):
         '''Fills the members attribute with a dictionary containing
-        all members from the module.'''
+        all members from the module. Returns the set of member names.
+        If imports is provided, it is updated with the imports needed
+        by the collected members. Names in excluded are skipped.'''
         if not mod:
             raise RuntimeError("failed to import module")
         if mod is MemberInfo.NO_VALUE:
-            return
+            return set()
 
         existing_names = set(m.name for m in members)
 
@@ -812,25 +968,25 @@ class ScrapeState(object):
             scope, scope_alias = None, None
 
         mod_scope = (self.module_name + '.' + scope) if scope else self.module_name
+        mod_scope_prefix = mod_scope + '.'
         mod_doc = getattr(mod, '__doc__', None)
-        mro = (getattr(mod, '__mro__', None) or ())[1:]
-        for name in dir(mod):
-            if keyword.iskeyword(name):
-                continue
-            try:
-                m = substitutes[name]
-                if m:
-                    members.append(m)
-                continue
-            except LookupError:
-                pass
-            try:
-                m = substitutes[mod_scope + '.' + name]
+        mro = self._get_mro_dicts(mod)
+        if mro:
+            meta_names, meta_data_names = self._get_meta_names(mod)
+        else:
+            meta_names = meta_data_names = frozenset()
+        skip_names = KEYWORDS.union(excluded) if excluded else KEYWORDS
+        for name in [n for n in dir(mod) if n not in skip_names]:
+            m = substitutes.get(name, _MISSING)
+            if m is _MISSING:
+                m = substitutes.get(mod_scope_prefix + name, _MISSING)
+            if m is not _MISSING:
                 if m:
                     members.append(m)
+                    existing_names.add(m.name)
+                    if imports is not None:
+                        imports.update(m.need_imports)
                 continue
-            except LookupError:
-                pass
 
             if name in existing_names:
                 continue
@@ -838,38 +994,96 @@ class ScrapeState(object):
             try:
                 value = getattr(mod, name)
             except AttributeError:
-                warnings.warn("attribute " + name + " on " + repr(mod) + " was in dir() but not getattr()", InspectWarning)
+                self._warnings.append("attribute " + name + " on " + repr(mod) + " was in dir() but not getattr()")
             except Exception:
-                warnings.warn("error getting " + name + " for " + repr(mod), InspectWarning)
+                self._warnings.append("error getting " + name + " for " + repr(mod))
             else:
                 if not self._should_add_value(value):
                     continue
-                if self._mro_contains(mro, name, value):
+                if self._mro_contains(mro, meta_names, meta_data_names, name, value):
                     continue
-                members.append(MemberInfo(name, value, scope=scope, module=self.module_name, module_doc=mod_doc, scope_alias=scope_alias))
+                mi = MemberInfo(name, value, scope=scope, module=self.module_name, module_doc=mod_doc, scope_alias=scope_alias)
+                members.append(mi)
+                existing_names.add(mi.name)
+                if imports is not None:
+                    imports.update(mi.need_imports)
+
+        return existing_names
 
     def _should_add_value(self, value):
+        value_type = type(value)
+        if value_type is MODULE_TYPE:
+            # Disallow nested modules
+            return
+
         try:
-            value_type = type(value)
             mod = getattr(value_type, '__module__', None)
             name = value_type.__name__
         except Exception:
-            warnings.warn("error getting typename", InspectWarning)
+            self._warnings.append("error getting typename")
             return
 
-        if (mod, name) == (builtins.__name__, 'CompiledLib'):
+        if name == 'CompiledLib' and mod == builtins.__name__:
             # Always allow CFFI lib
             return True
 
-        if issubclass(value_type, (type(sys), type(inspect))):
+        if issubclass(value_type, MODULE_TYPE):
             # Disallow nested modules
             return
 
         # By default, include all values
         return True
 
-    def _mro_contains(self, mro, name, value):
-        for m in mro:
+    def _get_mro_dicts(self, mod):
+        '''Returns the base classes of mod paired with their __dict__.'''
+        mro = (getattr(mod, '__mro__', None) or ())[1:]
+        return [(m, getattr(m, '__dict__', None)) for m in mro]
+
+    def _get_meta_names(self, mod):
+        '''Returns the names provided by the metaclass of mod, and the
+        subset of those that are data descriptors.'''
+        meta = type(mod)
+        names = self._meta_names.get(meta)
+        if names is None:
+            meta_names = set()
+            meta_data_names = set()
+            for t in getattr(meta, '__mro__', ()):
+                for n, v in getattr(t, '__dict__', {}).items():
+                    if n in meta_names:
+                        continue
+                    meta_names.add(n)
+                    if hasattr(type(v), '__set__'):
+                        meta_data_names.add(n)
+            names = self._meta_names[meta] = meta_names, meta_data_names
+        return names
+
+    def _mro_contains(self, mro, meta_names, meta_data_names, name, value):
+        if name in meta_data_names:
+            # Data descriptors on the metaclass take precedence over the
+            # class __dict__s, so use full lookups
+            return self._mro_getattr_contains(mro, name, value)
+        found = False
+        for m, m_dict in mro:
+            if m_dict is None:
+                if self._mro_getattr_contains(((m, m_dict),), name, value):
+                    return True
+                continue
+            mro_value = m_dict.get(name, _MISSING)
+            if mro_value is _MISSING:
+                continue
+            if mro_value is value:
+                return True
+            found = True
+            if hasattr(type(mro_value), '__get__'):
+                # Descriptors such as staticmethod only match once bound
+                if self._mro_getattr_contains(((m, m_dict),), name, value):
+                    return True
+        if not found and name in meta_names:
+            # Only the metaclass provides the name
+            return self._mro_getattr_contains(mro, name, value)
+
+    def _mro_getattr_contains(self, mro, name, value):
+        for m, _ in mro:
             try:
                 mro_value = getattr(m, name)
             except Exception:
@@ -882,392 +1096,414 @@ class ScrapeState(object):
         pass
 
     def dump(self, out):
-        imports = set()
-        for value in self.members:
-            for mod in value.need_imports:
-                imports.add(mod)
-        imports.discard(self.module_name)
+        imports = self._get_sorted_imports()
 
+        # Render everything first so it can be written out in one call
+        lines = []
         if imports:
-            for mod in sorted(imports):
-                print("import " + mod, file=out)
-            print("", file=out)
+            for mod in imports:
+                lines.append("import " + mod)
+            lines.append("")
 
         for value in self.members:
-            s = value.as_str('')
-            try:
-                print(s, file=out)
-            except TypeError:
-                print(repr(s), file=sys.stderr)
-                raise
+            value._emit(lines, '')
+        lines.append("")
+
+        bad = [s for s in lines if not isinstance(s, (str, unicode))]
+        if bad:
+            print(repr(bad[0]), file=sys.stderr)
+            raise TypeError('cannot write ' + type(bad[0]).__name__ + ' to output')
+
+        out.write('\n'.join(lines))
+        out.flush()
+
+# Types of builtin objects that are not otherwise exposed by name
+BYTES_ITERATOR_TYPE = type(iter(bytes()))
+UNICODE_ITERATOR_TYPE = type(iter(unicode()))
+FUNCTION_TYPE = type(safe_callable)
+BUILTIN_METHOD_DESCRIPTOR_TYPE = type(object.__hash__)
+BUILTIN_FUNCTION_TYPE = type(abs)
+GENERATOR_TYPE = type((_ for _ in []))
+ELLIPSIS_TYPE = type(Ellipsis)
+TUPLE_ITERATOR_TYPE = type(iter(()))
+LIST_ITERATOR_TYPE = type(iter([]))
+DICT_KEYS_TYPE = type({}.keys())
+DICT_VALUES_TYPE = type({}.values())
+DICT_ITEMS_TYPE = type({}.items())
+SET_ITERATOR_TYPE = type(iter(set()))
+CALLABLE_ITERATOR_TYPE = type(iter((lambda: None), None))
+
+# Builtin types written out by add_builtin_objects, in order. Each alias
+# maps to either a type, or the name of another alias it is equal to.
+BUILTIN_TYPE_ALIASES = (
+    ('__Object__', object),
+    ('__Type__', type),
+    ('__Int__', int),
+    ('__Bool__', '__Int__' if type(bool()) is int else bool),
+    ('__Long__', long if sys.version_info[0] < 3 else '__Int__'),
+    ('__Float__', float),
+    ('__Complex__', complex),
+    ('__Tuple__', tuple),
+    ('__List__', list),
+    ('__Dict__', dict),
+    ('__Set__', set),
+    ('__FrozenSet__', frozenset),
+)
+
+if bytes is not str:
+    BUILTIN_TYPE_ALIASES += (
+        ('__Bytes__', bytes),
+        ('__BytesIterator__', BYTES_ITERATOR_TYPE),
+        ('__Unicode__', str),
+        ('__UnicodeIterator__', UNICODE_ITERATOR_TYPE),
+        ('__Str__', '__Unicode__'),
+        ('__StrIterator__', '__UnicodeIterator__'),
+    )
+else:
+    BUILTIN_TYPE_ALIASES += (
+        ('__Bytes__', str),
+        ('__BytesIterator__', BYTES_ITERATOR_TYPE),
+        ('__Unicode__', unicode),
+        ('__UnicodeIterator__', UNICODE_ITERATOR_TYPE),
+        ('__Str__', '__Bytes__'),
+        ('__StrIterator__', '__BytesIterator__'),
+    )
+
+BUILTIN_TYPE_ALIASES += (
+    ('__Module__', MODULE_TYPE),
+    ('__Function__', FUNCTION_TYPE),
+    ('__BuiltinMethodDescriptor__', BUILTIN_METHOD_DESCRIPTOR_TYPE),
+    ('__BuiltinFunction__', BUILTIN_FUNCTION_TYPE),
+    ('__Generator__', GENERATOR_TYPE),
+    ('__Property__', property),
+    ('__ClassMethod__', classmethod),
+    ('__StaticMethod__', staticmethod),
+    ('__Ellipsis__', ELLIPSIS_TYPE),
+    ('__TupleIterator__', TUPLE_ITERATOR_TYPE),
+    ('__ListIterator__', LIST_ITERATOR_TYPE),
+    ('__DictKeys__', DICT_KEYS_TYPE),
+    ('__DictValues__', DICT_VALUES_TYPE),
+    ('__DictItems__', DICT_ITEMS_TYPE),
+    ('__SetIterator__', SET_ITERATOR_TYPE),
+    ('__CallableIterator__', CALLABLE_ITERATOR_TYPE),
+)
+
+# Overrides for known restypes and argspecs that only apply when
+# scraping the builtins module (see add_builtin_objects).
+BUILTIN_KNOWN_RESTYPES = {
+    "__Type__.__call__": "cls()",
+    "__Property__.__delete__": "None",
+    "__Float__.__getformat__": "''",
+    "__Bytes__.__getitem__": "__T__()",
+    "__Unicode__.__getitem__": "__T__()",
+    "__Type__.__instancecheck__": "False",
+    "__Tuple__.__iter__": "__TupleIterator__()",
+    "__List__.__iter__": "__ListIterator__()",
+    "__Dict__.__iter__": "__DictKeys__()",
+    "__Set__.__iter__": "__SetIterator__()",
+    "__FrozenSet__.__iter__": "__SetIterator__()",
+    "__Bytes__.__iter__": "__BytesIterator__()",
+    "__Unicode__.__iter__": "__UnicodeIterator__()",
+    "__BytesIterator__.__next__": "0",
+    "__UnicodeIterator__.__next__": "__Unicode__()",
+    "__Type__.__prepare__": "None",
+    "__List__.__reversed__": "__ListIterator__()",
+    "__Float__.__setformat__": "None",
+    "__Type__.__subclasses__": "(cls,)",
+    "__truediv__": "__Float__()",
+    "__Type__.__subclasscheck__": "False",
+    "__subclasshook__": "False",
+    "__Set__.add": "None",
+    "__List__.append": "None",
+    "__Float__.as_integer_ratio": "(0, 0)",
+    "__Int__.bit_length": "0",
+    "capitalize": "__T__()",
+    "casefold": "__T__()",
+    "center": "__T__()",
+    "clear": "None",
+    "__Generator__.close": "None",
+    "conjugate": "__Complex__()",
+    "copy": "__T__()",
+    "count": "0",
+    "__Bytes__.decode": "''",
+    "__Property__.deleter": "func",
+    "__Set__.difference": "__T__()",
+    "__FrozenSet__.difference": "__T__()",
+    "__Set__.difference_update": "None",
+    "__Set__.discard": "None",
+    "__Bytes__.encode": "b''",
+    "__Unicode__.encode": "b''",
+    "endswith": "False",
+    "expandtabs": "__T__()",
+    "__List__.extend": "None",
+    "find": "0",
+    "__Unicode__.format": "__T__()",
+    "__Unicode__.format_map": "__T__()",
+    "__Bool__.from_bytes": "False",
+    "__Int__.from_bytes": "0",
+    "__Long__.from_bytes": "__Long__()",
+    "__Float__.fromhex": "0.0",
+    "__Bytes__.fromhex": "b''",
+    "__Dict__.fromkeys": "{}",
+    "__Dict__.get": "self[0]",
+    "__Property__.getter": "func",
+    "hex": "''",
+    "index": "0",
+    "__List__.insert": "None",
+    "__Set__.intersection": "__T__()",
+    "__FrozenSet__.intersection": "__T__()",
+    "__Set__.intersection_update": "None",
+    "isalnum": "False",
+    "isalpha": "False",
+    "isdecimal": "False",
+    "isdigit": "False",
+    "islower": "False",
+    "isidentifier": "False",
+    "isnumeric": "False",
+    "isprintable": "False",
+    "isspace": "False",
+    "istitle": "False",
+    "isupper": "False",
+    "__Float__.is_integer": "False",
+    "__Set__.isdisjoint": "False",
+    "__FrozenSet__.isdisjoint": "False",
+    "__DictKeys__.isdisjoint": "False",
+    "__DictItems__.isdisjoint": "False",
+    "__Set__.issubset": "False",
+    "__FrozenSet__.issubset": "False",
+    "__Set__.issuperset": "False",
+    "__FrozenSet__.issuperset": "False",
+    "__Dict__.items": "__DictItems__()",
+    "__Bytes__.join": "b''",
+    "__Unicode__.join": "''",
+    "__Dict__.keys": "__DictKeys__()",
+    "lower": "__T__()",
+    "ljust": "__T__()",
+    "lstrip": "__T__()",
+    "__Bytes__.maketrans": "b''",
+    "__Unicode__.maketrans": "{}",
+    "__Type__.mro": "[__Type__()]",
+    "partition": "(__T__(), __T__(), __T__())",
+    "__List__.pop": "self[0]",
+    "__Dict__.pop": "self.keys()[0]",
+    "__Set__.pop": "Any",
+    "__Dict__.popitem": "self.items()[0]",
+    "remove": "None",
+    "replace": "__T__()",
+    "rfind": "0",
+    "__List__.reverse": "None",
+    "rindex": "0",
+    "rjust": "__T__()",
+    "rpartition": "(__T__(), __T__(), __T__())",
+    "rsplit": "[__T__()]",
+    "rstrip": "__T__()",
+    "__Generator__.send": "self.__next__()",
+    "__Dict__.setdefault": "self[0]",
+    "__Property__.setter": "func",
+    "__List__.sort": "None",
+    "split": "[__T__()]",
+    "splitlines": "[self()]",
+    "startswith": "False",
+    "strip": "__T__()",
+    "swapcase": "__T__()",
+    "__Set__.symmetric_difference": "__T__()",
+    "__FrozenSet__.symmetric_difference": "__T__()",
+    "__Set__.symmetric_difference_update": "None",
+    "__Bytes__.translate": "__T__()",
+    "__Unicode__.translate": "__T__()",
+    "__Generator__.throw": "None",
+    "title": "__T__()",
+    "to_bytes": "b''",
+    "__Set__.union": "__T__()",
+    "__FrozenSet__.union": "__T__()",
+    "__Dict__.update": "None",
+    "__Set__.update": "None",
+    "upper": "__T__()",
+    "__Dict__.values": "__DictValues__()",
+    "zfill": "__T__()",
+}
 
-def add_builtin_objects(state):
-    Signature.KNOWN_RESTYPES.update({
-        "__Type__.__call__": "cls()",
-        "__Property__.__delete__": "None",
-        "__Float__.__getformat__": "''",
-        "__Bytes__.__getitem__": "__T__()",
-        "__Unicode__.__getitem__": "__T__()",
-        "__Type__.__instancecheck__": "False",
-        "__Tuple__.__iter__": "__TupleIterator__()",
-        "__List__.__iter__": "__ListIterator__()",
-        "__Dict__.__iter__": "__DictKeys__()",
-        "__Set__.__iter__": "__SetIterator__()",
-        "__FrozenSet__.__iter__": "__SetIterator__()",
-        "__Bytes__.__iter__": "__BytesIterator__()",
-        "__Unicode__.__iter__": "__UnicodeIterator__()",
-        "__BytesIterator__.__next__": "0",
-        "__UnicodeIterator__.__next__": "__Unicode__()",
-        "__Type__.__prepare__": "None",
-        "__List__.__reversed__": "__ListIterator__()",
-        "__Float__.__setformat__": "None",
-        "__Type__.__subclasses__": "(cls,)",
-        "__truediv__": "__Float__()",
-        "__Type__.__subclasscheck__": "False",
-        "__subclasshook__": "False",
-        "__Set__.add": "None",
-        "__List__.append": "None",
-        "__Float__.as_integer_ratio": "(0, 0)",
-        "__Int__.bit_length": "0",
-        "capitalize": "__T__()",
-        "casefold": "__T__()",
-        "center": "__T__()",
-        "clear": "None",
-        "__Generator__.close": "None",
-        "conjugate": "__Complex__()",
-        "copy": "__T__()",
-        "count": "0",
-        "__Bytes__.decode": "''",
-        "__Property__.deleter": "func",
-        "__Set__.difference": "__T__()",
-        "__FrozenSet__.difference": "__T__()",
-        "__Set__.difference_update": "None",
-        "__Set__.discard": "None",
-        "__Bytes__.encode": "b''",
-        "__Unicode__.encode": "b''",
-        "endswith": "False",
-        "expandtabs": "__T__()",
-        "__List__.extend": "None",
-        "find": "0",
-        "__Unicode__.format": "__T__()",
-        "__Unicode__.format_map": "__T__()",
-        "__Bool__.from_bytes": "False",
-        "__Int__.from_bytes": "0",
-        "__Long__.from_bytes": "__Long__()",
-        "__Float__.fromhex": "0.0",
-        "__Bytes__.fromhex": "b''",
-        "__Dict__.fromkeys": "{}",
-        "__Dict__.get": "self[0]",
-        "__Property__.getter": "func",
-        "hex": "''",
-        "index": "0",
-        "__List__.insert": "None",
-        "__Set__.intersection": "__T__()",
-        "__FrozenSet__.intersection": "__T__()",
-        "__Set__.intersection_update": "None",
-        "isalnum": "False",
-        "isalpha": "False",
-        "isdecimal": "False",
-        "isdigit": "False",
-        "islower": "False",
-        "isidentifier": "False",
-        "isnumeric": "False",
-        "isprintable": "False",
-        "isspace": "False",
-        "istitle": "False",
-        "isupper": "False",
-        "__Float__.is_integer": "False",
-        "__Set__.isdisjoint": "False",
-        "__FrozenSet__.isdisjoint": "False",
-        "__DictKeys__.isdisjoint": "False",
-        "__DictItems__.isdisjoint": "False",
-        "__Set__.issubset": "False",
-        "__FrozenSet__.issubset": "False",
-        "__Set__.issuperset": "False",
-        "__FrozenSet__.issuperset": "False",
-        "__Dict__.items": "__DictItems__()",
-        "__Bytes__.join": "b''",
-        "__Unicode__.join": "''",
-        "__Dict__.keys": "__DictKeys__()",
-        "lower": "__T__()",
-        "ljust": "__T__()",
-        "lstrip": "__T__()",
-        "__Bytes__.maketrans": "b''",
-        "__Unicode__.maketrans": "{}",
-        "__Type__.mro": "[__Type__()]",
-        "partition": "(__T__(), __T__(), __T__())",
-        "__List__.pop": "self[0]",
-        "__Dict__.pop": "self.keys()[0]",
-        "__Set__.pop": "Any",
-        "__Dict__.popitem": "self.items()[0]",
-        "remove": "None",
-        "replace": "__T__()",
-        "rfind": "0",
-        "__List__.reverse": "None",
-        "rindex": "0",
-        "rjust": "__T__()",
-        "rpartition": "(__T__(), __T__(), __T__())",
-        "rsplit": "[__T__()]",
-        "rstrip": "__T__()",
-        "__Generator__.send": "self.__next__()",
-        "__Dict__.setdefault": "self[0]",
-        "__Property__.setter": "func",
-        "__List__.sort": "None",
-        "split": "[__T__()]",
-        "splitlines": "[self()]",
-        "startswith": "False",
-        "strip": "__T__()",
-        "swapcase": "__T__()",
-        "__Set__.symmetric_difference": "__T__()",
-        "__FrozenSet__.symmetric_difference": "__T__()",
-        "__Set__.symmetric_difference_update": "None",
-        "__Bytes__.translate": "__T__()",
-        "__Unicode__.translate": "__T__()",
-        "__Generator__.throw": "None",
-        "title": "__T__()",
-        "to_bytes": "b''",
-        "__Set__.union": "__T__()",
-        "__FrozenSet__.union": "__T__()",
-        "__Dict__.update": "None",
-        "__Set__.update": "None",
-        "upper": "__T__()",
-        "__Dict__.values": "__DictValues__()",
-        "zfill": "__T__()",
-    })
+BUILTIN_KNOWN_ARGSPECS = {
+    "__Type__.__call__": "(cls, *args, **kwargs)",
+    "__Int__.__ceil__": "(self)",
+    "__Int__.__floor__": "(self)",
+    "__Float__.__getformat__": "(typestr)",
+    "__Dict__.__getitem__": "(self, key)",
+    "__Type__.__instancecheck__": "(self, instance)",
+    "__Bool__.__init__": "(self, x)",
+    "__Int__.__init__": "(self, x=0)",
+    "__List__.__init__": "(self, iterable)",
+    "__Tuple__.__init__": "(self, iterable)",
+    "__Type__.__prepare__": "(cls, name, bases, **kwds)",
+    "__Int__.__round__": "(self, ndigits=0)",
+    "__Float__.__round__": "(self, ndigits=0)",
+    "__List__.__reversed__": "(self)",
+    "__Float__.__setformat__": "(typestr, fmt)",
+    "__Dict__.__setitem__": "(self, key, value)",
+    "__Set__.add": "(self, value)",
+    "__List__.append": "(self, value)",
+    "__Float__.as_integer_ratio": "(self)",
+    "__Int__.bit_length": "(self)",
+    "capitalize": "(self)",
+    "casefold": "(self)",
+    "__Bytes__.center": "(self, width, fillbyte=b' ')",
+    "__Unicode__.center": "(self, width, fillchar=' ')",
+    "clear": "(self)",
+    "__Generator__.close": "(self)",
+    "conjugate": "(self)",
+    "copy": "(self)",
+    "count": "(self, x)",
+    "__Bytes__.count": "(self, sub, start=0, end=-1)",
+    "__Unicode__.count": "(self, sub, start=0, end=-1)",
+    "__Bytes__.decode": "(self, encoding='utf-8', errors='strict')",
+    "__Property__.deleter": "(self, func)",
+    "__Set__.difference": "(self, other)",
+    "__FrozenSet__.difference": "(self, other)",
+    "__Set__.difference_update": "(self, *others)",
+    "__Set__.discard": "(self, elem)",
+    "__Unicode__.encode": "(self, encoding='utf-8', errors='strict')",
+    "endswith": "(self, suffix, start=0, end=-1)",
+    "expandtabs": "(self, tabsize=8)",
+    "__List__.extend": "(self, iterable)",
+    "find": "(self, sub, start=0, end=-1)",
+    "__Unicode__.format": "(self, *args, **kwargs)",
+    "__Unicode__.format_map": "(self, mapping)",
+    "__Bool__.from_bytes": "(bytes, byteorder, *, signed=False)",
+    "__Int__.from_bytes": "(bytes, byteorder, *, signed=False)",
+    "__Float__.fromhex": "(string)",
+    "__Dict__.get": "(self, key, d=Unknown())",
+    "__Property__.getter": "(self, func)",
+    "hex": "(self)",
+    "__List__.insert": "(self, index, value)",
+    "index": "(self, v)",
+    "__Bytes__.index": "(self, sub, start=0, end=-1)",
+    "__Unicode__.index": "(self, sub, start=0, end=-1)",
+    "__Set__.intersection": "(self, other)",
+    "__FrozenSet__.intersection": "(self, other)",
+    "__Set__.intersection_update": "(self, *others)",
+    "isalnum": "(self)",
+    "isalpha": "(self)",
+    "isdecimal": "(self)",
+    "isdigit": "(self)",
+    "isidentifier": "(self)",
+    "islower": "(self)",
+    "isnumeric": "(self)",
+    "isprintable": "(self)",
+    "isspace": "(self)",
+    "istitle": "(self)",
+    "isupper": "(self)",
+    "__Float__.is_integer": "(self)",
+    "__Set__.isdisjoint": "(self, other)",
+    "__FrozenSet__.isdisjoint": "(self, other)",
+    "__DictKeys__.isdisjoint": "(self, other)",
+    "__DictItems__.isdisjoint": "(self, other)",
+    "__Set__.issubset": "(self, other)",
+    "__FrozenSet__.issubset": "(self, other)",
+    "__Set__.issuperset": "(self, other)",
+    "__FrozenSet__.issuperset": "(self, other)",
+    "__Dict__.items": "(self)",
+    "__Bytes__.join": "(self, iterable)",
+    "__Unicode__.join": "(self, iterable)",
+    "__Dict__.keys": "(self)",
+    "lower": "(self)",
+    "__Bytes__.ljust": "(self, width, fillbyte=b' ')",
+    "__Unicode__.ljust": "(self, width, fillchar=' ')",
+    "lstrip": "(self, chars)",
+    "__Bytes__.maketrans": "(from_, to)",
+    "__Unicode__.maketrans": "(x, y, z)",
+    "__Type__.mro": "(cls)",
+    "__Bytes__.partition": "(self, sep)",
+    "__Unicode__.partition": "(self, sep)",
+    "__List__.pop": "(self, index=-1)",
+    "__Dict__.pop": "(self, k, d=Unknown())",
+    "__Set__.pop": "(self)",
+    "__Dict__.popitem": "(self, k, d=Unknown())",
+    "__List__.remove": "(self, value)",
+    "__Set__.remove": "(self, elem)",
+    "replace": "(self, old, new, count=-1)",
+    "__List__.reverse": "(self)",
+    "rfind": "(self, sub, start=0, end=-1)",
+    "rindex": "(self, sub, start=0, end=-1)",
+    "__Bytes__.rjust": "(self, width, fillbyte=b' ')",
+    "__Unicode__.rjust": "(self, width, fillchar=' ')",
+    "__Bytes__.rpartition": "(self, sep)",
+    "__Unicode__.rpartition": "(self, sep)",
+    "rsplit": "(self, sep=None, maxsplit=-1)",
+    "rstrip": "(self, chars=None)",
+    "__Generator__.send": "(self, value)",
+    "__Dict__.setdefault": "(self, k, d)",
+    "__Property__.setter": "(self, func)",
+    "__List__.sort": "(self)",
+    "split": "(self, sep=None, maxsplit=-1)",
+    "splitlines": "(self, keepends=False)",
+    "strip": "(self, chars=None)",
+    "startswith": "(self, prefix, start=0, end=-1)",
+    "swapcase": "(self)",
+    "__Set__.symmetric_difference": "(self, other)",
+    "__FrozenSet__.symmetric_difference": "(self, other)",
+    "__Set__.symmetric_difference_update": "(self, *others)",
+    "__Generator__.throw": "(self, type, value=None, traceback=None)",
+    "title": "(self)",
+    "__Int__.to_bytes": "(bytes, byteorder, *, signed=False)",
+    "__Bytes__.translate": "(self, table, delete=b'')",
+    "__Unicode__.translate": "(self, table)",
+    "__Set__.union": "(self, *others)",
+    "__FrozenSet__.union": "(self, *others)",
+    "__Dict__.update": "(self, d)",
+    "__Set__.update": "(self, *others)",
+    "upper": "(self)",
+    "__Dict__.values": "(self)",
+    "zfill": "(self, width)",
+}
 
-    Signature.KNOWN_ARGSPECS.update({
-        "__Type__.__call__": "(cls, *args, **kwargs)",
-        "__Int__.__ceil__": "(self)",
-        "__Int__.__floor__": "(self)",
-        "__Float__.__getformat__": "(typestr)",
-        "__Dict__.__getitem__": "(self, key)",
-        "__Type__.__instancecheck__": "(self, instance)",
-        "__Bool__.__init__": "(self, x)",
-        "__Int__.__init__": "(self, x=0)",
-        "__List__.__init__": "(self, iterable)",
-        "__Tuple__.__init__": "(self, iterable)",
-        "__Type__.__prepare__": "(cls, name, bases, **kwds)",
-        "__Int__.__round__": "(self, ndigits=0)",
-        "__Float__.__round__": "(self, ndigits=0)",
-        "__List__.__reversed__": "(self)",
-        "__Float__.__setformat__": "(typestr, fmt)",
-        "__Dict__.__setitem__": "(self, key, value)",
-        "__Set__.add": "(self, value)",
-        "__List__.append": "(self, value)",
-        "__Float__.as_integer_ratio": "(self)",
-        "__Int__.bit_length": "(self)",
-        "capitalize": "(self)",
-        "casefold": "(self)",
-        "__Bytes__.center": "(self, width, fillbyte=b' ')",
-        "__Unicode__.center": "(self, width, fillchar=' ')",
-        "clear": "(self)",
-        "__Generator__.close": "(self)",
-        "conjugate": "(self)",
-        "copy": "(self)",
-        "count": "(self, x)",
-        "__Bytes__.count": "(self, sub, start=0, end=-1)",
-        "__Unicode__.count": "(self, sub, start=0, end=-1)",
-        "__Bytes__.decode": "(self, encoding='utf-8', errors='strict')",
-        "__Property__.deleter": "(self, func)",
-        "__Set__.difference": "(self, other)",
-        "__FrozenSet__.difference": "(self, other)",
-        "__Set__.difference_update": "(self, *others)",
-        "__Set__.discard": "(self, elem)",
-        "__Unicode__.encode": "(self, encoding='utf-8', errors='strict')",
-        "endswith": "(self, suffix, start=0, end=-1)",
-        "expandtabs": "(self, tabsize=8)",
-        "__List__.extend": "(self, iterable)",
-        "find": "(self, sub, start=0, end=-1)",
-        "__Unicode__.format": "(self, *args, **kwargs)",
-        "__Unicode__.format_map": "(self, mapping)",
-        "__Bool__.from_bytes": "(bytes, byteorder, *, signed=False)",
-        "__Int__.from_bytes": "(bytes, byteorder, *, signed=False)",
-        "__Float__.fromhex": "(string)",
-        "__Dict__.get": "(self, key, d=Unknown())",
-        "__Property__.getter": "(self, func)",
-        "hex": "(self)",
-        "__List__.insert": "(self, index, value)",
-        "index": "(self, v)",
-        "__Bytes__.index": "(self, sub, start=0, end=-1)",
-        "__Unicode__.index": "(self, sub, start=0, end=-1)",
-        "__Set__.intersection": "(self, other)",
-        "__FrozenSet__.intersection": "(self, other)",
-        "__Set__.intersection_update": "(self, *others)",
-        "isalnum": "(self)",
-        "isalpha": "(self)",
-        "isdecimal": "(self)",
-        "isdigit": "(self)",
-        "isidentifier": "(self)",
-        "islower": "(self)",
-        "isnumeric": "(self)",
-        "isprintable": "(self)",
-        "isspace": "(self)",
-        "istitle": "(self)",
-        "isupper": "(self)",
-        "__Float__.is_integer": "(self)",
-        "__Set__.isdisjoint": "(self, other)",
-        "__FrozenSet__.isdisjoint": "(self, other)",
-        "__DictKeys__.isdisjoint": "(self, other)",
-        "__DictItems__.isdisjoint": "(self, other)",
-        "__Set__.issubset": "(self, other)",
-        "__FrozenSet__.issubset": "(self, other)",
-        "__Set__.issuperset": "(self, other)",
-        "__FrozenSet__.issuperset": "(self, other)",
-        "__Dict__.items": "(self)",
-        "__Bytes__.join": "(self, iterable)",
-        "__Unicode__.join": "(self, iterable)",
-        "__Dict__.keys": "(self)",
-        "lower": "(self)",
-        "__Bytes__.ljust": "(self, width, fillbyte=b' ')",
-        "__Unicode__.ljust": "(self, width, fillchar=' ')",
-        "lstrip": "(self, chars)",
-        "__Bytes__.maketrans": "(from_, to)",
-        "__Unicode__.maketrans": "(x, y, z)",
-        "__Type__.mro": "(cls)",
-        "__Bytes__.partition": "(self, sep)",
-        "__Unicode__.partition": "(self, sep)",
-        "__List__.pop": "(self, index=-1)",
-        "__Dict__.pop": "(self, k, d=Unknown())",
-        "__Set__.pop": "(self)",
-        "__Dict__.popitem": "(self, k, d=Unknown())",
-        "__List__.remove": "(self, value)",
-        "__Set__.remove": "(self, elem)",
-        "replace": "(self, old, new, count=-1)",
-        "__List__.reverse": "(self)",
-        "rfind": "(self, sub, start=0, end=-1)",
-        "rindex": "(self, sub, start=0, end=-1)",
-        "__Bytes__.rjust": "(self, width, fillbyte=b' ')",
-        "__Unicode__.rjust": "(self, width, fillchar=' ')",
-        "__Bytes__.rpartition": "(self, sep)",
-        "__Unicode__.rpartition": "(self, sep)",
-        "rsplit": "(self, sep=None, maxsplit=-1)",
-        "rstrip": "(self, chars=None)",
-        "__Generator__.send": "(self, value)",
-        "__Dict__.setdefault": "(self, k, d)",
-        "__Property__.setter": "(self, func)",
-        "__List__.sort": "(self)",
-        "split": "(self, sep=None, maxsplit=-1)",
-        "splitlines": "(self, keepends=False)",
-        "strip": "(self, chars=None)",
-        "startswith": "(self, prefix, start=0, end=-1)",
-        "swapcase": "(self)",
-        "__Set__.symmetric_difference": "(self, other)",
-        "__FrozenSet__.symmetric_difference": "(self, other)",
-        "__Set__.symmetric_difference_update": "(self, *others)",
-        "__Generator__.throw": "(self, type, value=None, traceback=None)",
-        "title": "(self)",
-        "__Int__.to_bytes": "(bytes, byteorder, *, signed=False)",
-        "__Bytes__.translate": "(self, table, delete=b'')",
-        "__Unicode__.translate": "(self, table)",
-        "__Set__.union": "(self, *others)",
-        "__FrozenSet__.union": "(self, *others)",
-        "__Dict__.update": "(self, d)",
-        "__Set__.update": "(self, *others)",
-        "upper": "(self)",
-        "__Dict__.values": "(self)",
-        "zfill": "(self, width)",
+# Python 2 differences from the overrides above
+if IS_PY2:
+    BUILTIN_KNOWN_RESTYPES.update({
+        "__BytesIterator__.__next__": None,
+        "__BytesIterator__.next": "b''",
+        "__UnicodeIterator__.__next__": None,
+        "__UnicodeIterator__.next": "u''",
+        "__Generator__.send": "self.next()",
+        "__Function__.func_closure": "()",
+        "__Function__.func_doc": "b''",
+        "__Function__.func_name": "b''",
     })
 
-    if sys.version[0] == '2':
-        Signature.KNOWN_RESTYPES.update({
-            "__BytesIterator__.__next__": None,
-            "__BytesIterator__.next": "b''",
-            "__UnicodeIterator__.__next__": None,
-            "__UnicodeIterator__.next": "u''",
-            "__Generator__.send": "self.next()",
-            "__Function__.func_closure": "()",
-            "__Function__.func_doc": "b''",
-            "__Function__.func_name": "b''",
-        })
-
-        Signature.KNOWN_ARGSPECS.update({
-            "__BytesIterator__.next": "(self)",
-            "__UnicodeIterator__.next": "(self)",
-        })
-
-
+    BUILTIN_KNOWN_ARGSPECS.update({
+        "__BytesIterator__.next": "(self)",
+        "__UnicodeIterator__.next": "(self)",
+    })
 
-    def add_simple(name, doc, *members):
-        mi = MemberInfo(name, MemberInfo.NO_VALUE)
-        mi.documentation = doc
-        mi.need_imports = (state.module_name,)
-        mi.members.extend(members)
-        state.members.append(mi)
+def add_builtin_objects(state):
+    Signature.update_known(BUILTIN_KNOWN_RESTYPES, BUILTIN_KNOWN_ARGSPECS)
 
-    def add_literal(name, literal):
-        state.members.append(MemberInfo(name, None, literal=literal))
+    need_imports = _shared_imports(state.module_name)
+    members = []
 
-    def add_type(alias, type_obj):
-        mi = MemberInfo(type_obj.__name__, type_obj, module=builtins.__name__, alias=alias)
-        state.members.append(mi)
-        state.members.append(MemberInfo(alias, None, literal=mi.name))
+    mi = MemberInfo('__Unknown__', MemberInfo.NO_VALUE)
+    mi.documentation = '<unknown>'
+    mi.need_imports = need_imports
+    mi.members.append(MemberInfo("__name__", None, literal='"<unknown>"'))
+    members.append(mi)
 
-    add_simple('__Unknown__', '<unknown>', MemberInfo("__name__", None, literal='"<unknown>"'))
-    add_simple('__NoneType__', 'the type of the None object', MemberInfo.NO_VALUE)
+    mi = MemberInfo('__NoneType__', MemberInfo.NO_VALUE)
+    mi.documentation = 'the type of the None object'
+    mi.need_imports = need_imports
+    mi.members.append(MemberInfo.NO_VALUE)
+    members.append(mi)
 
     # NoneType and None are explicitly defined to avoid parser errors
     # because of None being a keyword.
-    #add_literal('NoneType', '__NoneType__')
-    #add_literal('None', '__NoneType__()')
-
-    add_type('__Object__', object)
-    add_type('__Type__', type)
-    
-    add_type('__Int__', int)
-    if type(bool()) is int:
-        add_literal('__Bool__', '__Int__')
-    else:
-        add_type('__Bool__', bool)
-
-    try:
-        long
-    except NameError:
-        add_literal('__Long__', '__Int__')
-    else:
-        add_type('__Long__', long)
-
-    add_type("__Float__", float)
-    add_type("__Complex__", complex)
+    #members.append(MemberInfo('NoneType', None, literal='__NoneType__'))
+    #members.append(MemberInfo('None', None, literal='__NoneType__()'))
 
-    add_type("__Tuple__", tuple)
-    add_type("__List__", list)
-    add_type("__Dict__", dict)
-    add_type("__Set__", set)
-    add_type("__FrozenSet__", frozenset)
-
-    if bytes is not str:
-        add_type("__Bytes__", bytes)
-        add_type("__BytesIterator__", type(iter(bytes())))
-        add_type("__Unicode__", str)
-        add_type("__UnicodeIterator__", type(iter(str())))
-        add_literal("__Str__", "__Unicode__")
-        add_literal("__StrIterator__", "__UnicodeIterator__")
-
-    else:
-        add_type("__Bytes__", str)
-        add_type("__BytesIterator__", type(iter(str())))
-        add_type("__Unicode__", unicode)
-        add_type("__UnicodeIterator__", type(iter(unicode())))
-        add_literal("__Str__", "__Bytes__")
-        add_literal("__StrIterator__", "__BytesIterator__")
-
-    add_type("__Module__", type(inspect))
-    add_type("__Function__", type(add_simple))
-
-    add_type("__BuiltinMethodDescriptor__", type(object.__hash__))
-    add_type("__BuiltinFunction__", type(abs))
-    add_type("__Generator__", type((_ for _ in [])))
-    add_type("__Property__", property)
-    add_type("__ClassMethod__", classmethod)
-    add_type("__StaticMethod__", staticmethod)
-    add_type("__Ellipsis__", type(Ellipsis))
-    add_type("__TupleIterator__", type(iter(())))
-    add_type("__ListIterator__", type(iter([])))
-    add_type("__DictKeys__", type({}.keys()))
-    add_type("__DictValues__", type({}.values()))
-    add_type("__DictItems__", type({}.items()))
-    add_type("__SetIterator__", type(iter(set())))
-    add_type("__CallableIterator__", type(iter((lambda: None), None)))
+    for alias, type_obj in BUILTIN_TYPE_ALIASES:
+        if isinstance(type_obj, str):
+            members.append(MemberInfo(alias, None, literal=type_obj))
+        else:
+            mi = MemberInfo(type_obj.__name__, type_obj, module=builtins.__name__, alias=alias)
+            members.append(mi)
+            members.append(MemberInfo(alias, None, literal=mi.name))
 
     # Also write out the builtin module names here so that we cache them
     try:
@@ -1275,11 +1511,13 @@ def add_builtin_objects(state):
     except AttributeError:
         pass
     else:
-        add_literal('__builtin_module_names__', '"' + ','.join(builtin_module_names) + '"')
+        members.append(MemberInfo('__builtin_module_names__', None, literal='"' + ','.join(builtin_module_names) + '"'))
+
+    state.add_members(members)
 
 
 if __name__ == '__main__':
-    EXCLUDED_MEMBERS = ()
+    EXCLUDED_MEMBERS = frozenset()
 
     outfile = sys.stdout
     if '-u8' in sys.argv:
@@ -1297,9 +1535,9 @@ if __name__ == '__main__':
         state = ScrapeState(builtins.__name__, builtins)
         add_builtin_objects(state)
 
-        EXCLUDED_MEMBERS += ('None', 'False', 'True', '__debug__')
+        EXCLUDED_MEMBERS |= frozenset(['None', 'False', 'True', '__debug__'])
         if sys.version_info[0] == 2:
-            EXCLUDED_MEMBERS += ('print',)
+            EXCLUDED_MEMBERS |= frozenset(['print'])
 
     elif len(sys.argv) >= 2:
         state = ScrapeState(sys.argv[1])
@@ -1309,9 +1547,7 @@ if __name__ == '__main__':
         else:
             state.initial_import()
 
-    state.collect_top_level_members()
-
-    state.members[:] = [m for m in state.members if m.name not in EXCLUDED_MEMBERS]
+    state.collect_top_level_members(EXCLUDED_MEMBERS)
 
     state.collect_second_level_members()
 
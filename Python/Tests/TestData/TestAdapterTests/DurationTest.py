@@ -1,21 +1,34 @@
+import os
 import unittest
 import time
 
+def _get_duration_scale():
+    # Falls back to 1.0 like ScaledDuration in TestInfo.cs
+    try:
+        scale = float(os.environ.get('PTVS_DURATION_SCALE') or 1.0)
+    except ValueError:
+        return 1.0
+    # nan, inf and negative values cannot be slept for
+    return scale if 0 <= scale < float('inf') else 1.0
+
+# Scales the sleeps; TestInfo.cs scales the expected durations to match
+DURATION_SCALE = _get_duration_scale()
+
 class DurationTests(unittest.TestCase):
     def test_sleep_0_1(self):
-        time.sleep(0.1)
+        time.sleep(0.1 * DURATION_SCALE)
 
     def test_sleep_0_3(self):
-        time.sleep(0.3)
+        time.sleep(0.3 * DURATION_SCALE)
 
     def test_sleep_0_5(self):
-        time.sleep(0.5)
+        time.sleep(0.5 * DURATION_SCALE)
 
     def test_sleep_0_8(self):
-        time.sleep(0.8)
+        time.sleep(0.8 * DURATION_SCALE)
 
     def test_sleep_1_5(self):
-        time.sleep(1.5)
+        time.sleep(1.5 * DURATION_SCALE)
         self.assertTrue(False)
 
 if __name__ == '__main__':